@@ -100,9 +100,8 @@ class ResourceMemories(admission.MemoGetter, daemons.DaemonsMemoriesIterator):
         will be created *after* the resource creation really happens.
         """
         key = self._build_key(raw_body)
-        if key in self._items:
-            memory = self._items[key]
-        else:
+        memory = self._items.get(key)
+        if memory is None:
             if memobase is None:
                 memory = ResourceMemory(noticed_by_listing=noticed_by_listing)
             else:
@@ -120,8 +119,7 @@ class ResourceMemories(admission.MemoGetter, daemons.DaemonsMemoriesIterator):
         Forget the resource's memory if it exists; or ignore if it does not.
         """
         key = self._build_key(raw_body)
-        if key in self._items:
-            del self._items[key]
+        self._items.pop(key, None)
 
     def _build_key(
             self,
@@ -1,19 +1,87 @@
 import asyncio
+import json
 import textwrap
 
 import aiohttp.web
 import pytest
+from aresponses import ResponsesMockServer
 
 from kopf._cogs.clients.api import delete, get, patch, post, request, stream
 from kopf._cogs.clients.errors import APIError
 
+# Pre-serialized once: a response object itself cannot be reused, but its body can.
+EMPTY_JSON = json.dumps({}).encode()
+RESULT_JSON = json.dumps({'fake': 'result'}).encode()
+
+
+@pytest.fixture(scope='module')
+def event_loop(event_loop_factory):
+    """ Run all tests of this module in one loop instead of a new loop per test. """
+    loop = event_loop_factory()
+    yield loop
+    loop.close()
+
+
+class ReusableResponsesMockServer(ResponsesMockServer):
+    """
+    A mock server reused by many tests, with its routing state reset per test.
+
+    aresponses has no public API for this. This is the only place that touches
+    its private state; the attributes are as in aresponses 3.0.0.
+    """
+
+    def reset(self) -> None:
+        self._responses = []
+        self._unmatched_requests = []
+        self._history = []
+
+
+@pytest.fixture(scope='module')
+async def aresponses_server():
+    """ One mock server for the whole module: started & patched into aiohttp only once. """
+    async with ReusableResponsesMockServer(loop=asyncio.get_running_loop()) as server:
+        yield server
+
+
+@pytest.fixture()
+def aresponses(request, aresponses_server):
+    """ Override the `aresponses` plugin: reuse the server, but reset its routes per test. """
+    failures_before = request.session.testsfailed
+    try:
+        yield aresponses_server
+
+        # Fail the test which left the routes unused instead of silently discarding them.
+        # But only if the test has passed: otherwise, it would hide the actual failure.
+        if request.session.testsfailed == failures_before:
+            aresponses_server.assert_no_unused_routes(ignore_infinite_repeats=True)
+            aresponses_server.assert_all_requests_matched()
+    finally:
+        aresponses_server.reset()
+
+
+@pytest.fixture(params=['get', 'post', 'patch', 'delete'])
+def method(request):
+    """ An HTTP method to test; overridden by the tests of streams (GET-only). """
+    return request.param
+
+
+@pytest.fixture()
+def fn(method):
+    """ A parsing API function for the HTTP method being tested. """
+    return {'get': get, 'post': post, 'patch': patch, 'delete': delete}[method]
+
+
+@pytest.fixture()
+def ok_json_mock(resp_mocker, aresponses):
+    """ A server-side callback with an empty JSON object; to be routed by the tests. """
+    return resp_mocker(return_value=aresponses.Response(
+        body=EMPTY_JSON, content_type='application/json'))
+
 
-@pytest.mark.parametrize('method', ['get', 'post', 'patch', 'delete'])
 async def test_raw_requests_work(
-        resp_mocker, aresponses, hostname, method, settings, logger):
+        ok_json_mock, aresponses, hostname, method, settings, logger):
 
-    mock = resp_mocker(return_value=aiohttp.web.json_response({}))
-    aresponses.add(hostname, '/url', method, mock)
+    aresponses.add(hostname, '/url', method, ok_json_mock)
     response = await request(
         method=method,
         url='/url',
@@ -23,15 +91,14 @@ async def test_raw_requests_work(
         logger=logger,
     )
     assert isinstance(response, aiohttp.ClientResponse)  # unparsed!
-    assert mock.call_count == 1
-    assert isinstance(mock.call_args[0][0], aiohttp.web.BaseRequest)
-    assert mock.call_args[0][0].method.lower() == method
-    assert mock.call_args[0][0].path == '/url'
-    assert mock.call_args[0][0].data == {'fake': 'payload'}
-    assert mock.call_args[0][0].headers['fake'] == 'headers'  # and other system headers
+    assert ok_json_mock.call_count == 1
+    assert isinstance(ok_json_mock.call_args[0][0], aiohttp.web.BaseRequest)
+    assert ok_json_mock.call_args[0][0].method.lower() == method
+    assert ok_json_mock.call_args[0][0].path == '/url'
+    assert ok_json_mock.call_args[0][0].data == {'fake': 'payload'}
+    assert ok_json_mock.call_args[0][0].headers['fake'] == 'headers'  # and other system headers
 
 
-@pytest.mark.parametrize('method', ['get', 'post', 'patch', 'delete'])
 async def test_raw_requests_are_not_parsed(
         resp_mocker, aresponses, hostname, method, settings, logger):
 
@@ -41,50 +108,41 @@ async def test_raw_requests_are_not_parsed(
     assert isinstance(response, aiohttp.ClientResponse)
 
 
-@pytest.mark.parametrize('method', ['get', 'post', 'patch', 'delete'])
 async def test_server_errors_escalate(
         resp_mocker, aresponses, hostname, method, settings, logger):
 
-    mock = resp_mocker(return_value=aiohttp.web.json_response({}, status=666))
+    mock = resp_mocker(return_value=aresponses.Response(
+        body=EMPTY_JSON, content_type='application/json', status=666))
     aresponses.add(hostname, '/url', method, mock)
     with pytest.raises(APIError) as err:
         await request(method, '/url', settings=settings, logger=logger)
     assert err.value.status == 666
 
 
-@pytest.mark.parametrize('method', ['get', 'post', 'patch', 'delete'])
 async def test_relative_urls_are_prepended_with_server(
-        resp_mocker, aresponses, hostname, method, settings, logger):
+        ok_json_mock, aresponses, hostname, method, settings, logger):
 
-    mock = resp_mocker(return_value=aiohttp.web.json_response({}))
-    aresponses.add(hostname, '/url', method, mock)
+    aresponses.add(hostname, '/url', method, ok_json_mock)
     await request(method, '/url', settings=settings, logger=logger)
-    assert isinstance(mock.call_args[0][0], aiohttp.web.BaseRequest)
-    assert str(mock.call_args[0][0].url) == f'http://{hostname}/url'
+    assert isinstance(ok_json_mock.call_args[0][0], aiohttp.web.BaseRequest)
+    assert str(ok_json_mock.call_args[0][0].url) == f'http://{hostname}/url'
 
 
-@pytest.mark.parametrize('method', ['get', 'post', 'patch', 'delete'])
 async def test_absolute_urls_are_passed_through(
-        resp_mocker, aresponses, hostname, method, settings, logger):
+        ok_json_mock, aresponses, hostname, method, settings, logger):
 
-    mock = resp_mocker(return_value=aiohttp.web.json_response({}))
-    aresponses.add(hostname, '/url', method, mock)
-    aresponses.add('fakehost.localdomain', '/url', method, mock)
+    aresponses.add(hostname, '/url', method, ok_json_mock, repeat=aresponses.INFINITY)
+    aresponses.add('fakehost.localdomain', '/url', method, ok_json_mock)
     await request(method, 'http://fakehost.localdomain/url', settings=settings, logger=logger)
-    assert isinstance(mock.call_args[0][0], aiohttp.web.BaseRequest)
-    assert str(mock.call_args[0][0].url) == 'http://fakehost.localdomain/url'
+    assert isinstance(ok_json_mock.call_args[0][0], aiohttp.web.BaseRequest)
+    assert str(ok_json_mock.call_args[0][0].url) == 'http://fakehost.localdomain/url'
 
 
-@pytest.mark.parametrize('fn, method', [
-    (get, 'get'),
-    (post, 'post'),
-    (patch, 'patch'),
-    (delete, 'delete'),
-])
 async def test_parsing_in_requests(
         resp_mocker, aresponses, hostname, fn, method, settings, logger):
 
-    mock = resp_mocker(return_value=aiohttp.web.json_response({'fake': 'result'}))
+    mock = resp_mocker(return_value=aresponses.Response(
+        body=RESULT_JSON, content_type='application/json'))
     aresponses.add(hostname, '/url', method, mock)
     response = await fn(
         url='/url',
@@ -112,15 +170,13 @@ async def test_parsing_in_streams(
     """)))
     aresponses.add(hostname, '/url', method, mock)
 
-    items = []
-    async for item in stream(
+    items = [item async for item in stream(
         url='/url',
         payload={'fake': 'payload'},
         headers={'fake': 'headers'},
         settings=settings,
         logger=logger,
-    ):
-        items.append(item)
+    )]
 
     assert items == [{'fake': 'result1'}, {'fake': 'result2'}]
     assert mock.call_count == 1
@@ -131,56 +187,44 @@ async def test_parsing_in_streams(
     assert mock.call_args[0][0].headers['fake'] == 'headers'  # and other system headers
 
 
-@pytest.mark.parametrize('fn, method', [
-    (get, 'get'),
-    (post, 'post'),
-    (patch, 'patch'),
-    (delete, 'delete'),
-])
 async def test_direct_timeout_in_requests(
         resp_mocker, aresponses, hostname, fn, method, settings, logger, timer):
 
     async def serve_slowly():
-        await asyncio.sleep(1.0)
-        return aiohttp.web.json_response({})
+        await asyncio.sleep(0.1)
+        return aresponses.Response(body=EMPTY_JSON, content_type='application/json')
 
     mock = resp_mocker(side_effect=serve_slowly)
     aresponses.add(hostname, '/url', method, mock)
 
     with timer, pytest.raises(asyncio.TimeoutError):
-        timeout = aiohttp.ClientTimeout(total=0.1)
+        timeout = aiohttp.ClientTimeout(total=0.01)
         # aiohttp raises an asyncio.TimeoutError which is automatically retried.
         # To reduce the test duration we disable retries for this test.
         settings.networking.error_backoffs = None
         await fn('/url', timeout=timeout, settings=settings, logger=logger)
 
-    assert 0.1 < timer.seconds < 0.2
+    assert 0.009 <= timer.seconds < 0.1  # the loop clock may fire the timeout slightly early
 
 
-@pytest.mark.parametrize('fn, method', [
-    (get, 'get'),
-    (post, 'post'),
-    (patch, 'patch'),
-    (delete, 'delete'),
-])
 async def test_settings_timeout_in_requests(
         resp_mocker, aresponses, hostname, fn, method, settings, logger, timer):
 
     async def serve_slowly():
-        await asyncio.sleep(1.0)
-        return aiohttp.web.json_response({})
+        await asyncio.sleep(0.1)
+        return aresponses.Response(body=EMPTY_JSON, content_type='application/json')
 
     mock = resp_mocker(side_effect=serve_slowly)
     aresponses.add(hostname, '/url', method, mock)
 
     with timer, pytest.raises(asyncio.TimeoutError):
-        settings.networking.request_timeout = 0.1
+        settings.networking.request_timeout = 0.01
         # aiohttp raises an asyncio.TimeoutError which is automatically retried.
         # To reduce the test duration we disable retries for this test.
         settings.networking.error_backoffs = None
         await fn('/url', settings=settings, logger=logger)
 
-    assert 0.1 < timer.seconds < 0.2
+    assert 0.009 <= timer.seconds < 0.1  # the loop clock may fire the timeout slightly early
 
 
 @pytest.mark.parametrize('method', ['get'])  # the only supported method at the moment
@@ -188,21 +232,21 @@ async def test_direct_timeout_in_streams(
         resp_mocker, aresponses, hostname, method, settings, logger, timer):
 
     async def serve_slowly():
-        await asyncio.sleep(1.0)
+        await asyncio.sleep(0.1)
         return "{}"
 
     mock = resp_mocker(side_effect=serve_slowly)
     aresponses.add(hostname, '/url', method, mock)
 
     with timer, pytest.raises(asyncio.TimeoutError):
-        timeout = aiohttp.ClientTimeout(total=0.1)
+        timeout = aiohttp.ClientTimeout(total=0.01)
         # aiohttp raises an asyncio.TimeoutError which is automatically retried.
         # To reduce the test duration we disable retries for this test.
         settings.networking.error_backoffs = None
         async for _ in stream('/url', timeout=timeout, settings=settings, logger=logger):
             pass
 
-    assert 0.1 < timer.seconds < 0.2
+    assert 0.009 <= timer.seconds < 0.1  # the loop clock may fire the timeout slightly early
 
 
 @pytest.mark.parametrize('method', ['get'])  # the only supported method at the moment
@@ -210,54 +254,74 @@ async def test_settings_timeout_in_streams(
         resp_mocker, aresponses, hostname, method, settings, logger, timer):
 
     async def serve_slowly():
-        await asyncio.sleep(1.0)
+        await asyncio.sleep(0.1)
         return "{}"
 
     mock = resp_mocker(side_effect=serve_slowly)
     aresponses.add(hostname, '/url', method, mock)
 
     with timer, pytest.raises(asyncio.TimeoutError):
-        settings.networking.request_timeout = 0.1
+        settings.networking.request_timeout = 0.01
         # aiohttp raises an asyncio.TimeoutError which is automatically retried.
         # To reduce the test duration we disable retries for this test.
         settings.networking.error_backoffs = None
         async for _ in stream('/url', settings=settings, logger=logger):
             pass
 
-    assert 0.1 < timer.seconds < 0.2
+    assert 0.009 <= timer.seconds < 0.1  # the loop clock may fire the timeout slightly early
 
 
-@pytest.mark.parametrize('delay, expected', [
-    pytest.param(0.0, [], id='instant-none'),
-    pytest.param(0.1, [{'fake': 'result1'}], id='fast-single'),
-    pytest.param(9.9, [{'fake': 'result1'}, {'fake': 'result2'}], id='inf-double'),
-])
 @pytest.mark.parametrize('method', ['get'])  # the only supported method at the moment
 async def test_stopper_in_streams(
-        resp_mocker, aresponses, hostname, method, delay, expected, settings, logger):
+        resp_mocker, aresponses, hostname, method, settings, logger):
+
+    # The server sends the lines only when allowed, so the stopper's timing is deterministic.
+    send_1st: asyncio.Event
+    send_2nd: asyncio.Event
 
     async def stream_slowly(request: aiohttp.web.Request) -> aiohttp.web.StreamResponse:
+        gate_1st, gate_2nd = send_1st, send_2nd  # of the current case, not of the next ones
         response = aiohttp.web.StreamResponse()
         await response.prepare(request)
         try:
-            await asyncio.sleep(0.05)
+            await gate_1st.wait()
             await response.write(b'{"fake": "result1"}\n')
-            await asyncio.sleep(0.15)
+            await gate_2nd.wait()
             await response.write(b'{"fake": "result2"}\n')
             await response.write_eof()
         except ConnectionError:
             pass  # the client side sometimes disconnects earlier, ignore it
         return response
 
-    aresponses.add(hostname, '/url', method, stream_slowly)
-
-    stopper = asyncio.Future()
-    asyncio.get_running_loop().call_later(delay, stopper.set_result, None)
-
-    items = []
-    async for item in stream('/url', stopper=stopper, settings=settings, logger=logger):
-        items.append(item)
-
-    assert items == expected
-
-    await asyncio.sleep(0.2)  # give the response some time to be cancelled and its tasks closed
+    # All cases are served by the same server route, one after another.
+    cases = [
+        (0, []),  # instant-none
+        (1, [{'fake': 'result1'}]),  # fast-single
+        (None, [{'fake': 'result1'}, {'fake': 'result2'}]),  # inf-double
+    ]
+    aresponses.add(hostname, '/url', method, stream_slowly, repeat=len(cases))
+
+    for stop_after, expected in cases:
+        send_1st = asyncio.Event()
+        send_2nd = asyncio.Event()
+        stopper = asyncio.Future()
+        if stop_after == 0:
+            stopper.set_result(None)
+        else:
+            send_1st.set()
+
+        items = []
+        async for item in stream('/url', stopper=stopper, settings=settings, logger=logger):
+            items.append(item)
+            if len(items) == stop_after:
+                stopper.set_result(None)
+            else:
+                send_2nd.set()
+
+        # Let the server finish the response to the already disconnected client.
+        send_1st.set()
+        send_2nd.set()
+
+        assert items == expected, f"Unexpected items when stopped after {stop_after} items."
+
+    await asyncio.sleep(0)  # give the server-side response a cycle to finish its tasks
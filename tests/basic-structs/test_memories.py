@@ -1,64 +1,65 @@
-from mock import Mock
+import types
+
+import pytest
 
-from kopf._cogs.structs.bodies import Body
 from kopf._cogs.structs.ephemera import Memo
 from kopf._core.reactor.inventory import ResourceMemories, ResourceMemory
 
-BODY: Body = {
-    'metadata': {
+# Read-only, since the same body is shared by all the tests & steps of this module.
+BODY = types.MappingProxyType({
+    'metadata': types.MappingProxyType({
         'uid': 'uid1',
-    }
-}
+    }),
+})
+
+
+@pytest.fixture(scope='module')
+def event_loop(event_loop_factory):
+    """ Run all tests of this module in one loop instead of a new loop per test. """
+    loop = event_loop_factory()
+    yield loop
+    loop.close()
 
 
 def test_creation_with_defaults():
     ResourceMemory()
 
 
-async def test_recalling_creates_when_absent():
+async def test_memory_lifecycle():
     memories = ResourceMemories()
-    memory = await memories.recall(BODY)
-    assert isinstance(memory, ResourceMemory)
 
+    # Forgetting ignores when absent.
+    await memories.forget(BODY)
 
-async def test_recalling_reuses_when_present():
-    memories = ResourceMemories()
+    # Recalling creates when absent.
     memory1 = await memories.recall(BODY)
-    memory2 = await memories.recall(BODY)
-    assert memory1 is memory2
+    assert isinstance(memory1, ResourceMemory)
 
+    # The memo is auto-created.
+    assert isinstance(memory1.memo, Memo)
 
-async def test_forgetting_deletes_when_present():
-    memories = ResourceMemories()
-    memory1 = await memories.recall(BODY)
-    await memories.forget(BODY)
-
-    # Check by recalling -- it should be a new one.
+    # Recalling reuses when present.
     memory2 = await memories.recall(BODY)
-    assert memory1 is not memory2
+    assert memory2 is memory1
 
-
-async def test_forgetting_ignores_when_absent():
-    memories = ResourceMemories()
+    # Forgetting deletes when present. Check by recalling -- it should be a new one.
     await memories.forget(BODY)
-
-
-async def test_memo_is_autocreated():
-    memories = ResourceMemories()
-    memory = await memories.recall(BODY)
-    assert isinstance(memory.memo, Memo)
+    memory3 = await memories.recall(BODY)
+    assert memory3 is not memory1
 
 
 async def test_memo_is_shallow_copied():
 
+    copies = 0
+
     class MyMemo(Memo):
         def __copy__(self):
-            mock()
+            nonlocal copies
+            copies += 1
             return MyMemo()
 
-    mock = Mock()
     memobase = MyMemo()
     memories = ResourceMemories()
     memory = await memories.recall(BODY, memobase=memobase)
-    assert mock.call_count == 1
+    assert copies == 1
     assert memory.memo is not memobase
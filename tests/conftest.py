@@ -677,6 +677,30 @@ def assert_logs(caplog):
 #
 # Helpers for asyncio checks.
 #
+@pytest.fixture(scope='session')
+def event_loop_factory():
+    """
+    A factory of loops for the modules that share one loop for all their tests.
+
+    It is not used by default. The modules of cheap async tests opt in
+    by overriding the ``event_loop`` fixture with a module-scoped one,
+    which creates the loop with this factory, yields it, and closes it.
+    (Test modules cannot import helpers from conftest: it is ambiguous.)
+
+    If uvloop is installed, it is used for the loop -- but only in the opted-in
+    modules. The rest of the suite stays on the default asyncio loop regardless;
+    its uvloop coverage comes from the "uvloop" CI job (see ``.github/workflows``).
+    """
+    def new_event_loop() -> asyncio.AbstractEventLoop:
+        try:
+            import uvloop
+        except ImportError:
+            return asyncio.new_event_loop()
+        else:
+            return uvloop.new_event_loop()
+    return new_event_loop
+
+
 @pytest.fixture(autouse=True)
 def _no_asyncio_pending_tasks(event_loop):
     """